@@ -1,2 +1,3 @@
 from .version import __version__
 from .quiltloader import *
+from .shared import SharedImage
@@ -0,0 +1,473 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import tifffile as tfle
+import numpy as np
+import argparse
+import hashlib
+import quilt
+import json
+import time
+import sys
+import os
+
+import matplotlib.image as mpimg
+
+from .quiltloader import (QuiltLoader, _image_path, _tiff_layout, _image_channel_stats,
+                          _ChannelStats, _summarize_stats, _project_channels,
+                          _render_rgb_tile)
+
+def _stats_task(path, options):
+    return {'channels': [channel.state() for channel in _image_channel_stats(path)]}
+
+def _project_task(path, options):
+    projections, channels = _project_channels(path,
+                                    options['channels'],
+                                    options['use'],
+                                    options['percentile'])
+    np.save(options['output'], np.stack(projections))
+
+    return {'output': options['output']}
+
+def _thumbnail_task(path, options):
+    rgb = _render_rgb_tile(path,
+                           options['channels'],
+                           options['use'],
+                           options['percentile'],
+                           options['size'],
+                           options['limits'])
+    mpimg.imsave(options['output'], rgb)
+
+    return {'output': options['output']}
+
+def _import_zarr():
+    try:
+        import zarr
+    except ImportError:
+        raise ImportError('"quiltloader zarr" requires the zarr package, pip install zarr')
+
+    return zarr
+
+def _zarr_task(path, options):
+    zarr = _import_zarr()
+
+    # group is created up front, workers only add arrays
+    root = zarr.open_group(options['output'], mode='r+')
+    with tfle.TiffFile(path) as tif:
+        pages, t_index, z_index, c_index, shape = _tiff_layout(tif)
+        # one chunk per plane, written as each page is read
+        array = root.zeros(name=options['node'],
+                           shape=shape,
+                           chunks=(1, 1, 1) + shape[3:],
+                           dtype=tif.series[0].dtype,
+                           overwrite=True)
+        for i, page in enumerate(pages):
+            array[t_index[i], z_index[i], c_index[i]] = page.asarray()
+        array.attrs['axes'] = 'TZCYX'
+
+    return {'output': options['output'] + '/' + options['node']}
+
+def _options_hash(options, path):
+    # stable hash of the json serializable options a node was processed with and its image path
+    # quilt object paths are content addressed, so another package or changed data never matches
+    key = json.dumps({'options': options, 'image': path}, sort_keys=True)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+class _Checkpoint:
+    """
+    Parameters
+    ----------
+    path: str
+        The path of the checkpoint file.
+    restart: boolean
+        Boolean determining if an existing checkpoint should be discarded.
+    Output
+    ----------
+    An append only json lines record of completed nodes, the hash of the options and image each was processed with, and their results. Rerunning a job with the same output directory skips every node already recorded with the same options and image, nodes recorded with different ones are processed again. Only the options hash and line number of each node are held in memory, results are streamed back from the file by iter_results.
+    """
+
+    def __init__(self, path, restart=False):
+        self.path = path
+        # (group, node) -> (options hash, line number of the latest entry)
+        self.completed = dict()
+        # (group, node) done in this run, either skipped as already done or added
+        self.current = set()
+        self._lines = 0
+        if restart and os.path.exists(path):
+            os.remove(path)
+
+        for line_number, entry in self._entries():
+            self.completed[(entry['group'], entry['node'])] = (entry.get('options'), line_number)
+
+        self._write_out = open(path, 'a')
+        if self._write_out.tell() > 0:
+            with open(path, 'rb') as read_in:
+                read_in.seek(-1, os.SEEK_END)
+                if read_in.read(1) != b'\n':
+                    # terminate a partial line from an interrupted write
+                    self._write_out.write('\n')
+
+    def _entries(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path) as read_in:
+            for line in read_in:
+                self._lines += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # partial line from an interrupted write
+                    continue
+                yield self._lines - 1, entry
+
+    def is_done(self, group, node, options_hash):
+        done = self.completed.get((group, node))
+        if done is None or done[0] != options_hash:
+            return False
+
+        self.current.add((group, node))
+        return True
+
+    def add(self, group, node, options_hash, result):
+        self.completed[(group, node)] = (options_hash, self._lines)
+        self.current.add((group, node))
+        self._lines += 1
+        self._write_out.write(json.dumps({'group': group,
+                                          'node': node,
+                                          'options': options_hash,
+                                          'result': result}) + '\n')
+        self._write_out.flush()
+
+    def iter_results(self, group):
+        """
+        Parameters
+        ----------
+        group: str
+            The base level node to read results of.
+        Output
+        ----------
+        Generator yielding (node_name, result) of the latest entry of every node in group done in this run, read one line at a time. Entries of nodes that are not part of this run, such as those of another package, are skipped.
+        """
+
+        self._write_out.flush()
+        with open(self.path) as read_in:
+            for line_number, line in enumerate(read_in):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+
+                key = (entry['group'], entry['node'])
+                if entry['group'] == group and key in self.current and self.completed[key][1] == line_number:
+                    yield entry['node'], entry['result']
+
+    def close(self):
+        self._write_out.close()
+
+class _Progress:
+
+    def __init__(self, label, total, quiet=False):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.quiet = quiet
+        self.start = time.time()
+
+    def update(self, count=1):
+        self.done += count
+        if self.quiet:
+            return
+
+        elapsed = max(time.time() - self.start, 1e-9)
+        sys.stderr.write('\r[' + self.label + '] ' + str(self.done) + '/' + str(self.total) +
+                         ' nodes, ' + '{:.2f}'.format(self.done / elapsed) + ' nodes/s')
+        sys.stderr.flush()
+
+    def close(self):
+        if not self.quiet and self.total:
+            sys.stderr.write('\n')
+
+def _resolve_nodes(pkg, groups):
+    # (group, node_name, node, image path) for every node with an image
+    nodes = list()
+    missing = list()
+    for group in groups:
+        group_node = pkg.__dict__.get(group)
+        if not isinstance(group_node, quilt.nodes.GroupNode):
+            raise KeyError('package has no group "' + group + '"')
+
+        for node_name, node in group_node.items():
+            try:
+                nodes.append((group, node_name, node, _image_path(node)))
+            except (AttributeError, KeyError, TypeError):
+                missing.append(group + '/' + node_name)
+
+    return nodes, missing
+
+def _run_nodes(label, pkg, groups, task, options, checkpoint, workers=1, quiet=False):
+    """
+    Parameters
+    ----------
+    label: str
+        The job name used in progress reporting.
+    pkg: quilt.nodes.PackageNode
+        The loaded package.
+    groups: list
+        List of base level node names whose child nodes should be processed.
+    task: function
+        Module level function called with (path, options) for every node, returns a json serializable result.
+    options: function
+        Function given (group, node_name, node) returning the options dict for that node.
+    checkpoint: _Checkpoint
+        The checkpoint recording completed nodes.
+    workers: int
+        Number of worker processes, 1 runs every task in the current process.
+    Output
+    ----------
+    Runs task for every node with an image not already in the checkpoint with the same options and image path, recording each result as it completes, and returns the job summary counts.
+    """
+
+    nodes, missing = _resolve_nodes(pkg, groups)
+
+    # nodes done with different options or images are stale and processed again
+    todo = list()
+    for group, node_name, node, path in nodes:
+        node_options = options(group, node_name, node)
+        options_hash = _options_hash(node_options, path)
+        if not checkpoint.is_done(group, node_name, options_hash):
+            todo.append((group, node_name, path, node_options, options_hash))
+
+    summary = {'nodes': len(nodes),
+               'skipped': len(nodes) - len(todo),
+               'completed': 0,
+               'failed': dict(),
+               'no_image': missing,
+               'bytes_read': 0}
+
+    progress = _Progress(label, len(todo), quiet)
+
+    def record(node, result=None, error=None):
+        group, node_name, path, node_options, options_hash = node
+        if error is None:
+            checkpoint.add(group, node_name, options_hash, result)
+            summary['completed'] += 1
+            summary['bytes_read'] += os.path.getsize(path)
+        else:
+            summary['failed'][group + '/' + node_name] = repr(error)
+        progress.update()
+
+    if workers <= 1:
+        for node in todo:
+            try:
+                record(node, task(node[2], node[3]))
+            except Exception as e:
+                record(node, error=e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = dict()
+            for node in todo:
+                futures[pool.submit(task, node[2], node[3])] = node
+            for future in as_completed(futures):
+                try:
+                    record(futures[future], future.result())
+                except Exception as e:
+                    record(futures[future], error=e)
+
+    progress.close()
+
+    return summary
+
+def _index(pkg, args):
+    # write as_dataframe of every base level node
+    os.makedirs(os.path.join(args.output, 'index'), exist_ok=True)
+
+    groups = args.groups
+    if groups is None:
+        groups = [name for name, node in pkg.items()
+                  if isinstance(node, quilt.nodes.GroupNode)]
+
+    progress = _Progress('index', len(groups), args.quiet)
+    summary = {'nodes': 0, 'skipped': 0, 'completed': 0, 'failed': dict(), 'no_image': [], 'bytes_read': 0}
+    for group in groups:
+        try:
+            frame = getattr(pkg, group).as_dataframe()
+            frame.to_json(os.path.join(args.output, 'index', group + '.json'), orient='records')
+            summary['nodes'] += len(frame)
+            summary['completed'] += len(frame)
+        except Exception as e:
+            summary['failed'][group] = repr(e)
+        progress.update()
+    progress.close()
+
+    return summary
+
+def _stats(pkg, args, checkpoint):
+    summary = _run_nodes('stats', pkg, args.groups, _stats_task, lambda group, node_name, node: {},
+                         checkpoint, args.workers, args.quiet)
+
+    limits = (float(args.limits[0]), float(args.limits[1]))
+    percentiles = sorted(set([float(q) for q in args.percentiles] + list(limits)))
+    for group in args.groups:
+        # merge every node of this package, including those completed by earlier runs, one node at a time
+        node_channels = ((node_name, [_ChannelStats.from_state(state) for state in result['channels']])
+                         for node_name, result in checkpoint.iter_results(group))
+
+        stats = _summarize_stats(node_channels, percentiles, args.bins, limits)
+        with open(os.path.join(args.output, group + '_stats.json'), 'w') as write_out:
+            json.dump(stats, write_out)
+
+    return summary
+
+def _project(pkg, args, checkpoint):
+    for group in args.groups:
+        os.makedirs(os.path.join(args.output, 'projections', group), exist_ok=True)
+
+    def options(group, node_name, node):
+        return {'channels': args.channels,
+                'use': args.use,
+                'percentile': args.percentile,
+                'output': os.path.join(args.output, 'projections', group, node_name + '.npy')}
+
+    return _run_nodes('project', pkg, args.groups, _project_task, options, checkpoint, args.workers, args.quiet)
+
+def _thumbnails(pkg, args, checkpoint):
+    for group in args.groups:
+        os.makedirs(os.path.join(args.output, 'thumbnails', group), exist_ok=True)
+        if args.stats is not None:
+            getattr(pkg, group).load_stats(os.path.join(args.stats, group + '_stats.json'))
+
+    def options(group, node_name, node):
+        return {'channels': args.channels,
+                'use': args.use,
+                'percentile': args.percentile,
+                'size': args.size,
+                # every channel, selected with the channels actually projected
+                'limits': node.__dict__.get('_contrast_limits'),
+                'output': os.path.join(args.output, 'thumbnails', group, node_name + '.png')}
+
+    return _run_nodes('thumbnails', pkg, args.groups, _thumbnail_task, options, checkpoint, args.workers, args.quiet)
+
+def _zarr(pkg, args, checkpoint):
+    zarr = _import_zarr()
+    for group in args.groups:
+        zarr.open_group(os.path.join(args.output, group + '.zarr'), mode='a')
+
+    def options(group, node_name, node):
+        return {'node': node_name,
+                'output': os.path.join(args.output, group + '.zarr')}
+
+    return _run_nodes('zarr', pkg, args.groups, _zarr_task, options, checkpoint, args.workers, args.quiet)
+
+JOBS = {'index': _index,
+        'stats': _stats,
+        'project': _project,
+        'thumbnails': _thumbnails,
+        'zarr': _zarr}
+
+def _parser():
+    parser = argparse.ArgumentParser(prog='quiltloader',
+                                     description='batch precompute jobs and serving for quilt packages')
+    subparsers = parser.add_subparsers(dest='command')
+
+    def add_job(name, help):
+        job = subparsers.add_parser(name, help=help)
+        job.add_argument('package', help='package to process, as "org/pkg"')
+        job.add_argument('-o', '--output', default='.', help='output directory')
+        job.add_argument('-g', '--groups', nargs='+', default=None if name == 'index' else ['fovs'],
+                         help='base level nodes to process')
+        job.add_argument('-w', '--workers', type=int, default=1, help='number of worker processes')
+        job.add_argument('--restart', action='store_true', help='ignore any existing checkpoint')
+        job.add_argument('--summary', default=None, help='also write the json summary to this path')
+        job.add_argument('-q', '--quiet', action='store_true', help='disable progress reporting')
+        return job
+
+    def add_projection(job):
+        job.add_argument('--channels', type=int, nargs='+', default=[1, 3, 5])
+        job.add_argument('--use', choices=['max', 'mean', 'percentile'], default='max')
+        job.add_argument('--percentile', type=float, default=75.0)
+
+    add_job('index', 'write the as_dataframe metadata index of base level nodes')
+
+    stats = add_job('stats', 'compute per node and per channel intensity statistics')
+    stats.add_argument('--percentiles', type=float, nargs='+', default=[0.1, 1.0, 50.0, 99.0, 99.9])
+    stats.add_argument('--limits', type=float, nargs=2, default=[0.1, 99.9])
+    stats.add_argument('--bins', type=int, default=256)
+
+    project = add_job('project', 'save z projections of every node as npy')
+    add_projection(project)
+
+    thumbnails = add_job('thumbnails', 'render rgb thumbnails of every node as png')
+    add_projection(thumbnails)
+    thumbnails.add_argument('--size', type=int, default=256)
+    thumbnails.add_argument('--stats', default=None,
+                            help='directory holding <group>_stats.json to use as global contrast limits')
+
+    add_job('zarr', 'export every node image to a zarr group per base level node')
+
+    serve = subparsers.add_parser('serve', help='serve package metadata and projections over http')
+    serve.add_argument('package', help='package to serve, as "org/pkg"')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--workers', type=int, default=4, help='maximum images decoded at the same time')
+    serve.add_argument('--cache-size', type=int, default=128, help='maximum items held in the lru cache')
+
+    return parser
+
+def main(args=None):
+    """
+    Parameters
+    ----------
+    args: list
+        Optional list of command line arguments, defaults to sys.argv.
+    Output
+    ----------
+    Entry point of the quiltloader command. Precompute jobs resolve the package with QuiltLoader.ensure_package, checkpoint every completed node under the output directory so an interrupted job resumes where it stopped, report progress on stderr, and print a json summary of throughput on stdout.
+    """
+
+    parser = _parser()
+    args = parser.parse_args(args)
+
+    if args.command not in JOBS and args.command != 'serve':
+        parser.print_help()
+        return 1
+
+    try:
+        if args.command == 'serve':
+            from .server import serve
+            return serve(args.package,
+                         host=args.host,
+                         port=args.port,
+                         workers=args.workers,
+                         cache_size=args.cache_size)
+
+        pkg = QuiltLoader(args.package)
+    except ModuleNotFoundError as e:
+        sys.stderr.write(str(e) + '\n')
+        return 1
+    os.makedirs(args.output, exist_ok=True)
+
+    start = time.time()
+    if args.command == 'index':
+        summary = _index(pkg, args)
+    else:
+        checkpoint_dir = os.path.join(args.output, '.checkpoints')
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        checkpoint = _Checkpoint(os.path.join(checkpoint_dir, args.command + '.jsonl'), args.restart)
+        try:
+            summary = JOBS[args.command](pkg, args, checkpoint)
+        finally:
+            checkpoint.close()
+    seconds = time.time() - start
+
+    summary['command'] = args.command
+    summary['package'] = args.package
+    summary['seconds'] = seconds
+    summary['nodes_per_second'] = summary['completed'] / seconds if seconds > 0 else None
+    summary['mb_per_second'] = summary['bytes_read'] / 1e6 / seconds if seconds > 0 else None
+
+    output = json.dumps(summary, indent=4)
+    print(output)
+    if args.summary is not None:
+        with open(args.summary, 'w') as write_out:
+            write_out.write(output)
+
+    return 1 if summary['failed'] else 0
@@ -7,6 +7,11 @@ import quilt
 import types
 import json
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from .shared import SharedImage
+
 import matplotlib.pyplot as plt
 from IPython import get_ipython
 try:
@@ -14,18 +19,26 @@ try:
 except AttributeError:
     pass
 
-def _normalize_im(img):
+def _normalize_im(img, limits=None):
     """
     Parameters
     ----------
     img: np.ndarray
         The ndarray that should have all values normalized
+    limits: tuple
+        Optional (low, high) contrast limits to normalize with instead of the min and max of img.
+        Default: None
     Output
     ----------
     This is a normalize image function, the output of this normalization is in standard 0 - 255 value range.
     """
-    im_min = np.min(img)
-    im_max = np.max(img)
+    if limits is None:
+        im_min = np.min(img)
+        im_max = np.max(img)
+    else:
+        im_min, im_max = limits
+        # limits may fall inside the data range, avoid unsigned wraparound
+        img = img.astype(np.float64)
 
     img -= im_min
     img = img / (im_max - im_min)
@@ -37,20 +50,26 @@ def _normalize_im(img):
 
     return img
 
-def _channels_to_rgb(r, g, b):
+def _channels_to_rgb(r, g, b, limits=None):
     """
     Parameters
     ----------
     r, g, b: np.ndarray
         ndarray containing which data should be shown as each r, g, b channels of the output image.
+    limits: list
+        Optional list of (low, high) contrast limits for each of the r, g, b channels.
+        Default: None
     Output
     ----------
     Normalizes all color channels using _normalize_im, then stacks them and ensures integer for future computation.
     """
 
-    r = _normalize_im(r)
-    g = _normalize_im(g)
-    b = _normalize_im(b)
+    if limits is None:
+        limits = [None, None, None]
+
+    r = _normalize_im(r, limits[0])
+    g = _normalize_im(g, limits[1])
+    b = _normalize_im(b, limits[2])
     return np.stack((r,g,b), -1).astype(np.uint8)
 
 def _custom_try_except(node, key):
@@ -89,16 +108,15 @@ def _join_dicts(additions, defaults):
         Default set of items all custom dictionaries of this type must have.
     Output
     ----------
-    Uses the defaults object to determine if any default items are missing from the additions provided and applies the default items to those that are.
+    Uses the defaults object to determine if any default items are missing from the additions provided and returns a new dict with the default items applied to those that are. Neither additions nor defaults are modified.
     """
 
     # ensure loaders exist for each type of obj
-    for required, item in defaults.items():
-        if required not in additions.keys():
-            additions[required] = item
+    joined = dict(defaults)
+    joined.update(additions)
 
     # return completed loader dict
-    return additions
+    return joined
 
 def _find_nodes(head, label, nodes):
     # find and return a list of found quilt nodes
@@ -195,6 +213,444 @@ def check_node_for_image(self, img):
 
     return img
 
+def _image_path(node):
+    """
+    Parameters
+    ----------
+    node: quilt.nodes.GroupNode
+        The node to find the backing image file of.
+    Output
+    ----------
+    Resolves the image file of a node the same way check_node_for_image does, using the first associated fov if there is one, and returns the file path without decoding it.
+    """
+
+    try:
+        associates = node.get_associates()
+    except (AttributeError, KeyError, TypeError):
+        associates = dict()
+
+    if associates.get('fovs'):
+        node = associates['fovs'][0]
+
+    return getattr(node, 'image').load()
+
+def _tiff_layout(tif):
+    """
+    Parameters
+    ----------
+    tif: tifffile.TiffFile
+        The opened TiffFile to map.
+    Output
+    ----------
+    Returns the pages of the first series along with the time, z, and channel index of each page and the full [t, z, channel, y, x] shape, so images can be read one plane at a time.
+    """
+
+    series = tif.series[0]
+    lead_axes = list()
+    lead_shape = list()
+    plane_shape = list()
+    for axis, size in zip(series.axes, series.shape):
+        if axis in 'YX':
+            plane_shape.append(size)
+        elif axis != 'S':
+            lead_axes.append(axis)
+            lead_shape.append(size)
+
+    n_planes = int(np.prod(lead_shape))
+    positions = np.unravel_index(np.arange(n_planes), lead_shape)
+
+    indices = dict()
+    sizes = dict()
+    for axis in 'TZC':
+        if axis in lead_axes:
+            indices[axis] = positions[lead_axes.index(axis)]
+            sizes[axis] = lead_shape[lead_axes.index(axis)]
+        else:
+            indices[axis] = np.zeros(n_planes, dtype=int)
+            sizes[axis] = 1
+
+    shape = (sizes['T'], sizes['Z'], sizes['C']) + tuple(plane_shape)
+
+    return series.pages, indices['T'], indices['Z'], indices['C'], shape
+
+def _combine_samples(parts, max_samples):
+    """
+    Parameters
+    ----------
+    parts: list
+        List of (list of sample arrays, number of pixels the samples stand for) pairs.
+    max_samples: int
+        Maximum number of sample values to keep.
+    Output
+    ----------
+    Thins every part to the same sampling density, capped so at most max_samples values are kept, and returns the combined samples as a single array list. Each part keeps its share of the pixels, so merging many images stays bounded without over weighting the latest.
+    """
+
+    parts = [(np.concatenate(samples), count) for samples, count in parts
+             if count > 0 and sum(sample.size for sample in samples) > 0]
+    if not parts:
+        return list()
+
+    total = float(sum(count for samples, count in parts))
+    density = min([samples.size / float(count) for samples, count in parts] + [max_samples / total])
+
+    # integer strides keep the sample evenly spaced, rounding up keeps it under the cap
+    return [np.concatenate([samples[::max(1, int(np.ceil(samples.size / (count * density) - 1e-6)))]
+                            for samples, count in parts])]
+
+class _ChannelStats:
+    """
+    Parameters
+    ----------
+    dtype: np.dtype
+        The dtype of the planes that will be added.
+    Output
+    ----------
+    Running statistics of a single channel, updated one plane at a time and mergeable across images. Integer images up to 16 bit keep an exact value histogram, so quantiles are exact. Other images keep an evenly strided sample of every plane for approximate quantiles, thinned to at most max_samples values as planes and images are merged.
+    """
+
+    sample_per_plane = 4096
+    max_samples = 65536
+
+    def __init__(self, dtype):
+        self.dtype = np.dtype(dtype)
+        self.exact = self.dtype.kind in 'ui' and self.dtype.itemsize <= 2
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = None
+        self.max = None
+        self.offset = 0
+        if self.exact:
+            self.offset = -int(np.iinfo(self.dtype).min)
+            self.counts = np.zeros(2 ** (8 * self.dtype.itemsize), dtype=np.int64)
+        else:
+            self.samples = list()
+
+    def add(self, plane):
+        plane = plane.ravel()
+        plane_min = plane.min()
+        plane_max = plane.max()
+
+        self.count += plane.size
+        self.total += float(np.sum(plane, dtype=np.float64))
+        self.total_sq += float(np.dot(plane.astype(np.float64), plane.astype(np.float64)))
+        self.min = plane_min if self.min is None else min(self.min, plane_min)
+        self.max = plane_max if self.max is None else max(self.max, plane_max)
+
+        if self.exact:
+            self.counts += np.bincount(plane.astype(np.int64) + self.offset, minlength=self.counts.size)
+        else:
+            step = max(1, plane.size // self.sample_per_plane)
+            sample = plane[::step].astype(np.float64)
+            if sum(held.size for held in self.samples) + sample.size <= self.max_samples:
+                self.samples.append(sample)
+            else:
+                self.samples = _combine_samples([(self.samples, self.count - plane.size),
+                                                 ([sample], plane.size)],
+                                                self.max_samples)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+
+        if self.count == 0:
+            self.min = other.min
+            self.max = other.max
+        else:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+
+        if self.exact and other.exact and self.offset == other.offset and self.counts.size == other.counts.size:
+            self.counts += other.counts
+        else:
+            # mixed dtypes fall back to sampling, held to a fixed size however many images are merged
+            self.samples = _combine_samples([(self._sample(), self.count),
+                                             (other._sample(), other.count)],
+                                            self.max_samples)
+            self.exact = False
+
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+
+        return self
+
+    def _sample(self):
+        if not self.exact:
+            return list(self.samples)
+
+        # expand histogram values into an equivalent weighted sample
+        values = np.nonzero(self.counts)[0]
+        weights = self.counts[values]
+        step = max(1, int(np.sum(weights)) // (self.sample_per_plane * 16))
+        return [np.repeat(values - self.offset, np.maximum(weights // step, 1)).astype(np.float64)]
+
+    def percentiles(self, percentiles):
+        if self.count == 0:
+            return [None for q in percentiles]
+
+        if self.exact:
+            cdf = np.cumsum(self.counts)
+            targets = [max(1, int(np.ceil(q / 100.0 * self.count))) for q in percentiles]
+            return [int(np.searchsorted(cdf, target) - self.offset) for target in targets]
+
+        return [float(v) for v in np.percentile(np.concatenate(self.samples), percentiles)]
+
+    def histogram(self, bins):
+        if self.count == 0:
+            return {'counts': [], 'edges': []}
+
+        low = float(self.min)
+        high = float(self.max) if self.max > self.min else float(self.min) + 1
+        if self.exact:
+            values = np.arange(int(self.min), int(self.max) + 1)
+            counts, edges = np.histogram(values, bins=bins, range=(low, high + 1),
+                                         weights=self.counts[values + self.offset])
+        else:
+            counts, edges = np.histogram(np.concatenate(self.samples), bins=bins, range=(low, high))
+
+        return {'counts': [int(c) for c in counts], 'edges': [float(e) for e in edges]}
+
+    def state(self, max_samples=16384):
+        """
+        Output
+        ----------
+        Returns a compact json serializable state that from_state can restore and merge, the exact histogram is stored sparsely and samples are thinned to at most max_samples values.
+        """
+
+        state = {'dtype': self.dtype.str,
+                 'exact': self.exact,
+                 'count': self.count,
+                 'total': self.total,
+                 'total_sq': self.total_sq,
+                 'min': None if self.min is None else self.min.item(),
+                 'max': None if self.max is None else self.max.item()}
+
+        if self.exact:
+            values = np.nonzero(self.counts)[0]
+            state['values'] = [int(v) - self.offset for v in values]
+            state['counts'] = [int(c) for c in self.counts[values]]
+        else:
+            samples = np.concatenate(self.samples) if self.samples else np.zeros(0)
+            step = max(1, int(np.ceil(samples.size / float(max_samples))))
+            state['samples'] = [float(v) for v in samples[::step]]
+
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        stats = cls(state['dtype'])
+        stats.count = state['count']
+        stats.total = state['total']
+        stats.total_sq = state['total_sq']
+        if state['min'] is not None:
+            stats.min = stats.dtype.type(state['min'])
+            stats.max = stats.dtype.type(state['max'])
+
+        if state['exact']:
+            stats.counts[np.array(state['values'], dtype=np.int64) + stats.offset] = state['counts']
+        else:
+            stats.exact = False
+            stats.samples = [np.array(state['samples'], dtype=np.float64)]
+
+        return stats
+
+    def summary(self, percentiles, bins):
+        if self.count == 0:
+            return None
+
+        mean = self.total / self.count
+        std = np.sqrt(max(self.total_sq / self.count - mean ** 2, 0.0))
+
+        return {'min': self.min.item(),
+                'max': self.max.item(),
+                'mean': mean,
+                'std': float(std),
+                'count': self.count,
+                'percentiles': dict(zip([str(q) for q in percentiles],
+                                        self.percentiles(percentiles))),
+                'histogram': self.histogram(bins)}
+
+def _image_channel_stats(path):
+    """
+    Parameters
+    ----------
+    path: str
+        The path of the image file to collect statistics for.
+    Output
+    ----------
+    Reads the image one plane at a time and returns a list of _ChannelStats, one per channel. Only a single plane is held in memory at once.
+    """
+
+    with tfle.TiffFile(path) as tif:
+        pages, t_index, z_index, c_index, shape = _tiff_layout(tif)
+        channels = [_ChannelStats(tif.series[0].dtype) for c in range(shape[2])]
+        for i, page in enumerate(pages):
+            channels[c_index[i]].add(page.asarray())
+
+    return channels
+
+def _select_limits(limits, channels):
+    # per channel limits of the given channels, None when unavailable
+    if limits is None:
+        return None
+
+    try:
+        return [limits[c] for c in channels]
+    except IndexError:
+        return None
+
+def _get_contrast_limits(node, channels):
+    # global contrast limits stored by compute_stats or load_stats
+    return _select_limits(node.__dict__.get('_contrast_limits'), channels)
+
+def _apply_stats(self, stats, limits):
+    setattr(self, '_stats', stats)
+    global_limits = list()
+    for channel in stats['channels']:
+        if channel is None:
+            global_limits.append(None)
+        else:
+            global_limits.append((channel['percentiles'][str(limits[0])],
+                                  channel['percentiles'][str(limits[1])]))
+
+    for node_name, node_stats in stats['nodes'].items():
+        node = getattr(self, node_name)
+        setattr(node, '_stats', node_stats)
+        setattr(node, '_contrast_limits', global_limits)
+
+def _summarize_stats(node_channels, percentiles, bins, limits):
+    """
+    Parameters
+    ----------
+    node_channels: iterable
+        Iterable of (node_name, list of _ChannelStats) pairs, consumed one node at a time.
+    Output
+    ----------
+    Summarizes each node and merges it into global per channel statistics as it arrives, so only the merged statistics and a single node are held at once. Returns the statistics dict written by compute_stats.
+    """
+
+    merged = list()
+    node_stats = dict()
+    for node_name, channels in node_channels:
+        node_stats[node_name] = [channel.summary(percentiles, bins) for channel in channels]
+        for c, channel in enumerate(channels):
+            if c < len(merged):
+                merged[c].merge(channel)
+            else:
+                merged.append(channel)
+
+        # drop this node's histograms before reading the next
+        del channels
+
+    return {'percentiles': percentiles,
+            'limits': list(limits),
+            'channels': [channel.summary(percentiles, bins) for channel in merged],
+            'nodes': node_stats}
+
+def compute_stats(self, percentiles=[0.1, 1.0, 50.0, 99.0, 99.9], bins=256, limits=(0.1, 99.9), save_path=None):
+    """
+    Parameters
+    ----------
+    percentiles: list
+        List of percentiles to compute for each channel.
+        Default: [0.1, 1.0, 50.0, 99.0, 99.9]
+    bins: int
+        Number of histogram bins to store for each channel.
+        Default: 256
+    limits: tuple
+        The (low, high) percentiles used as global contrast limits by the display functions.
+        Default: (0.1, 99.9)
+    save_path: str
+        Optional path to write the computed statistics to as json.
+    Output
+    ----------
+    Streams every image of a base level GroupNode one plane at a time and computes the per node and per channel min, max, mean, std, histogram, and percentiles, reading each image once. The global per channel statistics are merged from every node. Results are stored on the GroupNode and its child nodes so the display functions normalize with consistent global contrast limits without re-reading pixels. Returns the statistics dict.
+    """
+
+    if not isinstance(self, quilt.nodes.GroupNode) or 'info' in self.__dict__:
+        raise TypeError('"compute_stats" is required to be called on a base level GroupNode')
+
+    limits = (float(limits[0]), float(limits[1]))
+    percentiles = sorted(set([float(q) for q in percentiles] + list(limits)))
+
+    def node_channels():
+        # read lazily so one node is held at a time
+        for node_name, node in self.items():
+            try:
+                path = _image_path(node)
+            except (AttributeError, KeyError, TypeError):
+                continue
+
+            yield node_name, _image_channel_stats(path)
+
+    stats = _summarize_stats(node_channels(), percentiles, bins, limits)
+
+    _apply_stats(self, stats, limits)
+
+    if save_path is not None:
+        with open(save_path, 'w') as write_out:
+            json.dump(stats, write_out)
+
+    return stats
+
+def load_stats(self, stats):
+    """
+    Parameters
+    ----------
+    stats: str/ dict
+        Path to a json file written by compute_stats, or the dict it returned.
+    Output
+    ----------
+    Applies previously computed statistics to a base level GroupNode and its child nodes without reading any pixel data. Returns the statistics dict.
+    """
+
+    if not isinstance(self, quilt.nodes.GroupNode) or 'info' in self.__dict__:
+        raise TypeError('"load_stats" is required to be called on a base level GroupNode')
+
+    if isinstance(stats, str):
+        with open(stats) as read_in:
+            stats = json.load(read_in)
+
+    _apply_stats(self, stats, stats['limits'])
+
+    return stats
+
+def share_image(self, img=None):
+    """
+    Parameters
+    ----------
+    img: TiffFile/ ndarray
+        Either TiffFile or ndarray to share.
+        Standard AICS image: [t, z, channel, y, x]
+    Output
+    ----------
+    Resolves the image the same way as the display functions, copies it into a multiprocessing.shared_memory block, and returns the owning SharedImage handle. A TiffFile is decoded directly into the block and the decoded image is not cached on the node, so sharing many nodes does not keep a private copy of each. The handle can be passed to multiprocessing workers without pickling the pixel data, workers read it with SharedImage.array.
+    """
+
+    if not isinstance(self, quilt.nodes.GroupNode):
+        raise TypeError('"share_image" requires a node with an image or an associated fov')
+
+    opened = None
+    if img is None and '_mem_img' in self.__dict__:
+        img = self._mem_img
+    elif img is None:
+        associates = self.get_associates()
+        if 'fovs' not in associates:
+            img = opened = self['image']
+        else:
+            img = opened = associates['fovs'][0]['image']
+
+    if not isinstance(img, (tfle.tifffile.TiffFile, np.ndarray)):
+        raise TypeError('share_image(img) requires img to be either type TiffFile or ndarray.')
+
+    try:
+        return SharedImage.from_array(img)
+    finally:
+        if isinstance(opened, tfle.tifffile.TiffFile):
+            opened.close()
+
 def display_channels(self, img=None, use_channels=[1, 3, 5, 6]):
     """
     Parameters
@@ -210,7 +666,11 @@ def display_channels(self, img=None, use_channels=[1, 3, 5, 6]):
     If given TiffFile object, will first retrieve the image data by using TiffFile.asarray(). Uses matplotlib to display the specified channels at the max of the z-stack.
     """
 
-    img = check_node_for_image(self, img)
+    if img is None and _streams_images(self):
+        # max over time one timepoint at a time instead of decoding the full time-lapse
+        img = reduce_time(self, 'max')
+    else:
+        img = check_node_for_image(self, img)
 
     # initialize plots
     fig, axes = plt.subplots(1, len(use_channels), figsize=(15, 10))
@@ -226,11 +686,15 @@ def display_channels(self, img=None, use_channels=[1, 3, 5, 6]):
     if img.shape[1] != 7:
         use_channels = [0, 1, 2, 3]
 
+    limits = _get_contrast_limits(self, use_channels)
+    if limits is None:
+        limits = [(None, None) for c in use_channels]
+
     # for each channel plot max of stack
     for i, ax in enumerate(axes):
         z_stack = img[:,use_channels[i],:,:]
         max_project = np.max(z_stack, 0)
-        ax.imshow(max_project)
+        ax.imshow(max_project, vmin=limits[i][0], vmax=limits[i][1])
         ax.set(xticks=[], yticks=[])
         ax.set_title('channel: ' + str(use_channels[i]))
 
@@ -257,7 +721,11 @@ def display_rgb(self, img=None, rgb_indices=[1, 3, 5], use='max', percentile=75.
     If given TiffFile object, will first retrieve the image data by using TiffFile.asarray(). Uses matplotlib to display the specified channels at the numpy function of the z-stack as rgb channels.
     """
 
-    img = check_node_for_image(self, img)
+    if img is None and _streams_images(self):
+        # only the first timepoint is displayed, read just its pages
+        img = next(iter_timepoints(self, timepoints=[0]))
+    else:
+        img = check_node_for_image(self, img)
 
     # if the image object is not in ndarray form now, it was not a valid arg
     if not isinstance(img, np.ndarray):
@@ -282,6 +750,8 @@ def display_rgb(self, img=None, rgb_indices=[1, 3, 5], use='max', percentile=75.
     if img.shape[1] != 7:
         rgb_indices = [0, 1, 2]
 
+    limits = _get_contrast_limits(self, rgb_indices)
+
     # get the rgb channel data using the specified numpy function
     if use == 'max' or use == 'all':
         r = np.max(img[:, rgb_indices[0], :, :], 0)
@@ -315,7 +785,8 @@ def display_rgb(self, img=None, rgb_indices=[1, 3, 5], use='max', percentile=75.
                         ' b: ' + str(rgb_indices[2]))
             ax.imshow(_channels_to_rgb(img_collection[i][0],
                                         img_collection[i][1],
-                                        img_collection[i][2]))
+                                        img_collection[i][2],
+                                        limits))
 
     else:
         # plot the image
@@ -323,7 +794,46 @@ def display_rgb(self, img=None, rgb_indices=[1, 3, 5], use='max', percentile=75.
         plt.title('r: ' + str(rgb_indices[0]) +
                     ' g: ' + str(rgb_indices[1]) +
                     ' b: ' + str(rgb_indices[2]))
-        plt.imshow(_channels_to_rgb(r, g, b))
+        plt.imshow(_channels_to_rgb(r, g, b, limits))
+
+def _stack_channels(img, use_indices, use, percentile, limits):
+    """
+    Parameters
+    ----------
+    img: np.ndarray
+        The [z, channel, y, x] ndarray to project.
+    use_indices: list
+        List containing the indices of which channels to stack.
+    use: string
+        String determing which numpy function to use for the z projection.
+    percentile: float
+        Float to be used if numpy function is specified to be 'percentile'.
+    limits: list
+        List of (low, high) contrast limits or None for each of the use_indices channels.
+    Output
+    ----------
+    Returns the sum of the normalized z projections of each channel, as displayed by display_stack.
+    """
+
+    # initialize empty numpy stack
+    real_values = np.zeros((img.shape[2], img.shape[3]))
+    # append the normalized the numpy stack for each channel added
+    for projection, i in enumerate(use_indices):
+        # get the channel data using the specified numpy function
+        if use == 'max':
+            max_stack = _normalize_im(np.max(img[:, i, :, :], 0), limits[projection])
+            real_values += max_stack
+
+        if use == 'mean':
+            max_stack = _normalize_im(np.mean(img[:, i, :, :], 0), limits[projection])
+            real_values += max_stack
+
+        if use == 'percentile':
+            max_stack = _normalize_im(np.percentile(
+                            img[:, i, :, :], percentile, 0), limits[projection])
+            real_values += max_stack
+
+    return real_values
 
 def display_stack(self, img=None, use_indices=[1, 3, 5], use='max', percentile=75.0, force_return=False):
     """
@@ -347,7 +857,11 @@ def display_stack(self, img=None, use_indices=[1, 3, 5], use='max', percentile=7
     If given TiffFile object, will first retrieve the image data by using TiffFile.asarray(). Uses matplotlib to display the specified channels at the numpy function of the z-stack on top of each other.
     """
 
-    img = check_node_for_image(self, img)
+    if img is None and _streams_images(self):
+        # only the first timepoint is displayed, read just its pages
+        img = next(iter_timepoints(self, timepoints=[0]))
+    else:
+        img = check_node_for_image(self, img)
 
     # if the image object is not in ndarray form now, it was not a valid arg
     if not isinstance(img, np.ndarray):
@@ -365,23 +879,11 @@ def display_stack(self, img=None, use_indices=[1, 3, 5], use='max', percentile=7
     if img.shape[1] != 7:
         use_indices = [0, 1, 2]
 
-    # initialize empty numpy stack
-    real_values = np.zeros((size[2], size[3]))
-    # append the normalized the numpy stack for each channel added
-    for projection, i in enumerate(use_indices):
-        # get the channel data using the specified numpy function
-        if use == 'max':
-            max_stack = _normalize_im(np.max(img[:, i, :, :], 0))
-            real_values += max_stack
-
-        if use == 'mean':
-            max_stack = _normalize_im(np.mean(img[:, i, :, :], 0))
-            real_values += max_stack
+    limits = _get_contrast_limits(self, use_indices)
+    if limits is None:
+        limits = [None for i in use_indices]
 
-        if use == 'percentile':
-            max_stack = _normalize_im(np.percentile(
-                            img[:, i, :, :], percentile, 0))
-            real_values += max_stack
+    real_values = _stack_channels(img, use_indices, use, percentile, limits)
 
     if force_return:
         return _normalize_im(real_values)
@@ -391,13 +893,14 @@ def display_stack(self, img=None, use_indices=[1, 3, 5], use='max', percentile=7
         fig, axes = plt.subplots(1, len(styles), figsize=(15, 10))
         axes = axes.flatten()
 
+        # project the already loaded volume, passing it back through display_stack would cache it as the node image
         img_collection = list()
         for i, style in enumerate(styles):
-            img_collection.append(self.display_stack(img,
-                                    use_indices=use_indices,
-                                    use=styles[i],
-                                    percentile=percentile,
-                                    force_return=True))
+            img_collection.append(_normalize_im(_stack_channels(img,
+                                    use_indices,
+                                    styles[i],
+                                    percentile,
+                                    limits)))
 
         # for each varient plot rgb
         for i, ax in enumerate(axes):
@@ -489,6 +992,453 @@ def display_segs(self, use='max', percentile=75.0, force_return=False):
         plt.axis('off')
         plt.imshow(real_values)
 
+def _read_timepoint(pages, page_indices, z_index, c_index, channels, shape, dtype, project, percentile):
+    # read the pages of one timepoint into a [z, c, y, x] volume or a [c, y, x] z projection
+    slots = dict((c, i) for i, c in enumerate(channels))
+
+    if project in [None, 'percentile']:
+        volume = np.zeros((shape[1], len(channels)) + shape[3:], dtype=dtype)
+        for i in page_indices:
+            if c_index[i] in slots:
+                volume[z_index[i], slots[c_index[i]]] = pages[i].asarray()
+
+        if project is None:
+            return volume
+
+        return np.percentile(volume, percentile, 0)
+
+    projection = None
+    seen = np.zeros(len(channels), dtype=bool)
+    for i in page_indices:
+        if c_index[i] not in slots:
+            continue
+
+        slot = slots[c_index[i]]
+        plane = pages[i].asarray()
+        if projection is None:
+            projection = np.zeros((len(channels),) + plane.shape, dtype=np.float64)
+
+        if project == 'max' and seen[slot]:
+            np.maximum(projection[slot], plane, out=projection[slot])
+        else:
+            projection[slot] += plane
+        seen[slot] = True
+
+    if project == 'mean':
+        projection /= shape[1]
+
+    return projection
+
+def _standard_channels(channels, n_channels):
+    # channels [0, 1, 2] are used when the image does not have the standard 7 channels, as the display functions do
+    if n_channels != 7:
+        return list(range(min(len(channels), n_channels)))
+
+    return list(channels)
+
+def _iter_timepoints(path, channels=None, project=None, percentile=75.0, timepoints=None):
+    """
+    Parameters
+    ----------
+    path: str/ TiffFile
+        The path of the image file to stream, or an already opened TiffFile which is left open.
+    channels: list
+        List containing the indices of which channels to read.
+        Default: None, all channels
+    project: string
+        Optional numpy function to z project each timepoint with, "max", "mean", or "percentile".
+        Default: None, full [z, c, y, x] volumes
+    percentile: float
+        Float to be used if project is specified to be 'percentile'.
+    timepoints: list
+        List of timepoints to read, in the order they should be yielded.
+        Default: None, every timepoint
+    Output
+    ----------
+    Generator yielding one timepoint at a time, read straight from the TIFF pages of that timepoint. Only a single timepoint is held in memory, max and mean projections only hold a single [c, y, x] accumulator. Raises IndexError for channels or timepoints the image does not have.
+    """
+
+    if project not in [None, 'max', 'mean', 'percentile']:
+        raise ValueError('projection "use" must be "max", "mean", or "percentile".')
+
+    if isinstance(path, tfle.TiffFile):
+        opened = nullcontext(path)
+    else:
+        opened = tfle.TiffFile(path)
+
+    with opened as tif:
+        pages, t_index, z_index, c_index, shape = _tiff_layout(tif)
+        if channels is None:
+            channels = list(range(shape[2]))
+        for c in channels:
+            if not 0 <= c < shape[2]:
+                raise IndexError('channel ' + str(c) + ' out of range for ' + str(shape[2]) + ' channels')
+
+        if timepoints is None:
+            timepoints = range(shape[0])
+        for t in timepoints:
+            if not 0 <= t < shape[0]:
+                raise IndexError('timepoint ' + str(t) + ' out of range for ' + str(shape[0]) + ' timepoints')
+
+        page_indices = dict((t, list()) for t in timepoints)
+        for i in range(len(pages)):
+            if t_index[i] in page_indices:
+                page_indices[t_index[i]].append(i)
+
+        # read repeated channels once
+        unique = list(dict.fromkeys(channels))
+        select = [unique.index(c) for c in channels]
+        axis = 1 if project is None else 0
+
+        for t in timepoints:
+            image = _read_timepoint(pages, page_indices[t], z_index, c_index,
+                                    unique, shape, tif.series[0].dtype, project, percentile)
+            if len(unique) != len(channels):
+                image = np.take(image, select, axis=axis)
+
+            yield image
+
+def _streams_images(self):
+    # images are streamed from the tiff file only when nothing custom is in the way
+    return ('_mem_img' not in self.__dict__ and
+            self.load_functions.get('image') is tfle.TiffFile)
+
+def iter_timepoints(self, project=None, channels=None, percentile=75.0, timepoints=None):
+    """
+    Parameters
+    ----------
+    project: string
+        Optional numpy function to z project each timepoint with, "max", "mean", or "percentile".
+        Default: None
+    channels: list
+        List containing the indices of which channels to read.
+        Default: None, all channels
+    percentile: float
+        Float to be used if project is specified to be 'percentile'.
+    timepoints: list
+        List of timepoints to read, in the order they should be yielded.
+        Default: None, every timepoint
+    Output
+    ----------
+    Generator yielding the image of a node one timepoint at a time, read straight from the TIFF pages, as [z, channel, y, x] volumes or, if project is given, [channel, y, x] projections. The full time-lapse is never decoded into memory.
+    """
+
+    return _iter_timepoints(_image_path(self),
+                            channels=channels,
+                            project=project,
+                            percentile=percentile,
+                            timepoints=timepoints)
+
+def reduce_time(self, reduce='max', project=None, channels=None, percentile=75.0, timepoints=None):
+    """
+    Parameters
+    ----------
+    reduce: string
+        The running reduction to apply over time, "max", "min", "sum", or "mean".
+        Default: 'max'
+    project: string
+        Optional numpy function to z project each timepoint with before reducing, "max", "mean", or "percentile".
+        Default: None
+    channels: list
+        List containing the indices of which channels to read.
+        Default: None, all channels
+    percentile: float
+        Float to be used if project is specified to be 'percentile'.
+    timepoints: list
+        List of timepoints to reduce over.
+        Default: None, every timepoint
+    Output
+    ----------
+    Streams the node image with iter_timepoints and reduces it over time with a running accumulator, returning a single [z, channel, y, x] volume or [channel, y, x] projection without materializing the full time-lapse.
+    """
+
+    if reduce not in ['max', 'min', 'sum', 'mean']:
+        raise ValueError('reduce_time parameter "reduce" must be "max", "min", "sum", or "mean".')
+
+    result = None
+    count = 0
+    for volume in iter_timepoints(self, project, channels, percentile, timepoints):
+        count += 1
+        if result is None:
+            result = volume.astype(np.float64) if reduce in ['sum', 'mean'] else volume
+        elif reduce == 'max':
+            np.maximum(result, volume, out=result)
+        elif reduce == 'min':
+            np.minimum(result, volume, out=result)
+        else:
+            result += volume
+
+    if reduce == 'mean' and count:
+        result /= count
+
+    return result
+
+def _project_channels(path, channels, use='max', percentile=75.0, timepoint=0):
+    """
+    Parameters
+    ----------
+    path: str
+        The path of the image file to project.
+    channels: list
+        List containing the indices of which channels to project.
+    use: string
+        String determing which numpy function to use for the z projection.
+        Default: 'max'
+    percentile: float
+        Float to be used if numpy function is specified to be 'percentile'.
+    timepoint: int
+        The timepoint to project.
+        Default: 0
+    Output
+    ----------
+    Reads only the pages of the requested channels at the requested timepoint and returns a list of z projections, one [y, x] ndarray per channel, along with the list of channels actually projected. Max and mean projections are accumulated plane by plane. If the image does not have the standard 7 channels, channels [0, 1, 2] are used as the display functions do, look up contrast limits with the returned channels.
+    """
+
+    if use not in ['max', 'mean', 'percentile']:
+        raise ValueError('projection "use" must be "max", "mean", or "percentile".')
+
+    with tfle.TiffFile(path) as tif:
+        channels = _standard_channels(channels, _tiff_layout(tif)[4][2])
+        projection = next(_iter_timepoints(tif,
+                                           channels=channels,
+                                           project=use,
+                                           percentile=percentile,
+                                           timepoints=[timepoint]))
+
+    return list(projection), channels
+
+def _downsample(plane, tile):
+    """
+    Parameters
+    ----------
+    plane: np.ndarray
+        The [y, x] ndarray to downsample.
+    tile: int
+        The maximum size of the longest side of the output.
+    Output
+    ----------
+    Area averages the plane by the smallest integer factor that fits its longest side within tile pixels.
+    """
+
+    factor = int(np.ceil(max(plane.shape) / float(tile)))
+    if factor <= 1:
+        return plane
+
+    y = (plane.shape[0] // factor) * factor
+    x = (plane.shape[1] // factor) * factor
+    plane = plane[:y, :x]
+
+    return plane.reshape(y // factor, factor, x // factor, factor).mean(axis=(1, 3))
+
+def _rgb_limits(contrast_limits, channels):
+    # limits of the projected channels padded to r, g, b
+    limits = _select_limits(contrast_limits, channels)
+    if limits is None:
+        return None
+
+    return (limits + [None, None, None])[:3]
+
+def _render_rgb_tile(path, rgb_indices, use, percentile, tile, contrast_limits):
+    # project, downsample, and normalize a single node to an rgb uint8 tile
+    # contrast_limits holds every channel, selected with the channels actually projected
+    planes, channels = _project_channels(path, rgb_indices, use, percentile)
+    planes = [_downsample(plane, tile) for plane in planes]
+    while len(planes) < 3:
+        planes.append(np.zeros(planes[0].shape))
+
+    return _channels_to_rgb(planes[0], planes[1], planes[2], _rgb_limits(contrast_limits, channels))
+
+def _render_montage(nodes, shape=None, tile=256, rgb_indices=[1, 3, 5], use='max', percentile=75.0, workers=4, save_path=None):
+    """
+    Parameters
+    ----------
+    nodes: list
+        List of (node_name, node) pairs to place in the montage.
+    Output
+    ----------
+    Shared implementation of montage for GroupNodes and NodeCollections, see montage.
+    """
+
+    paths = list()
+    for node_name, node in nodes:
+        try:
+            paths.append((node_name, _image_path(node), node.__dict__.get('_contrast_limits')))
+        except (AttributeError, KeyError, TypeError):
+            pass
+
+    if shape is None:
+        cols = max(int(np.ceil(np.sqrt(len(paths)))), 1)
+        rows = max(int(np.ceil(len(paths) / float(cols))), 1)
+    else:
+        rows, cols = shape
+    paths = paths[:rows * cols]
+
+    # single preallocated canvas, each worker writes its own tile slot
+    canvas = np.zeros((rows * tile, cols * tile, 3), dtype=np.uint8)
+
+    def place(i):
+        node_name, path, limits = paths[i]
+        try:
+            rgb = _render_rgb_tile(path, rgb_indices, use, percentile, tile, limits)
+        except Exception:
+            # an unreadable image leaves its tile blank instead of failing the montage
+            return node_name
+
+        top = (i // cols) * tile + (tile - rgb.shape[0]) // 2
+        left = (i % cols) * tile + (tile - rgb.shape[1]) // 2
+        canvas[top:top + rgb.shape[0], left:left + rgb.shape[1]] = rgb
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        failed = [node_name for node_name in pool.map(place, range(len(paths))) if node_name is not None]
+
+    if failed:
+        print('montage could not render ' + str(len(failed)) + ' node(s), left blank: ' + ', '.join(failed))
+
+    if save_path is not None:
+        plt.imsave(save_path, canvas)
+
+    return canvas
+
+def montage(self, shape=None, tile=256, rgb_indices=[1, 3, 5], use='max', percentile=75.0, workers=4, save_path=None):
+    """
+    Parameters
+    ----------
+    shape: tuple
+        The (rows, columns) of the montage grid. Nodes past rows * columns are dropped.
+        Default: None, the smallest near square grid fitting all nodes
+    tile: int
+        The size in pixels of each square tile.
+        Default: 256
+    rgb_indices: list
+        List containing the indices of which channels to use as r, g, b.
+        Default: [1, 3, 5]
+    use: string
+        String determing which numpy function to use for the z projection.
+        Default: 'max'
+    percentile: float
+        Float to be used if numpy function is specified to be 'percentile'.
+    workers: int
+        Number of worker threads loading and projecting images.
+        Default: 4
+    save_path: str
+        Optional path to write the montage image to, format is determined by the extension.
+    Output
+    ----------
+    Renders every child node of a base level GroupNode (or every node of a NodeCollection from where) as an rgb projection of the first timepoint, downsampled into a tile of one preallocated canvas. Images are read plane by plane by parallel workers and no figures are created. Global contrast limits from compute_stats are used when available. Nodes whose image cannot be read are left as blank tiles and their names are printed. Returns the [y, x, rgb] uint8 canvas.
+    """
+
+    if isinstance(self, NodeCollection):
+        nodes = self.items()
+    elif isinstance(self, quilt.nodes.GroupNode) and 'info' not in self.__dict__:
+        nodes = self.items()
+    else:
+        raise TypeError('"montage" is required to be called on a base level GroupNode or NodeCollection')
+
+    return _render_montage(nodes,
+                           shape=shape,
+                           tile=tile,
+                           rgb_indices=rgb_indices,
+                           use=use,
+                           percentile=percentile,
+                           workers=workers,
+                           save_path=save_path)
+
+def _matches(info, func, criteria):
+    if func is not None and not func(info):
+        return False
+
+    for key, value in criteria.items():
+        if key not in info:
+            return False
+        if isinstance(value, (list, tuple, set)):
+            if info[key] not in value:
+                return False
+        elif info[key] != value:
+            return False
+
+    return True
+
+def where(self, func=None, **criteria):
+    """
+    Parameters
+    ----------
+    func: function
+        Optional function given the info dict of each node, nodes are kept when it returns True.
+    criteria: keyword arguments
+        Info keys and the value they must equal, or a list of accepted values.
+        Ex: where(line='AICS-13', plate=[3500000938, 3500000939])
+    Output
+    ----------
+    Filters the child nodes of a base level GroupNode by their info metadata and returns the matching nodes as a NodeCollection, which supports montage, items, and further where calls.
+    """
+
+    if isinstance(self, NodeCollection):
+        nodes = self.items()
+    elif isinstance(self, quilt.nodes.GroupNode) and 'info' not in self.__dict__:
+        nodes = self.items()
+    else:
+        raise TypeError('"where" is required to be called on a base level GroupNode or NodeCollection')
+
+    found = list()
+    for node_name, node in nodes:
+        try:
+            info = node['info']
+        except (AttributeError, KeyError):
+            continue
+
+        if _matches(info, func, criteria):
+            found.append((node_name, node))
+
+    return NodeCollection(found)
+
+class NodeCollection:
+    """
+    Parameters
+    ----------
+    nodes: list
+        List of (node_name, node) pairs.
+    Output
+    ----------
+    An ordered selection of nodes returned by where. Indexing by int or slice returns nodes, indexing by str returns the node of that name.
+    """
+
+    def __init__(self, nodes):
+        self._nodes = list(nodes)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __iter__(self):
+        return iter([node for node_name, node in self._nodes])
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._nodes[key][1]
+
+        if isinstance(key, slice):
+            return [node for node_name, node in self._nodes[key]]
+
+        if isinstance(key, str):
+            for node_name, node in self._nodes:
+                if node_name == key:
+                    return node
+            raise KeyError(key)
+
+        print('unsupported iter-type:', type(key))
+        raise TypeError
+
+    def keys(self):
+        return [node_name for node_name, node in self._nodes]
+
+    def items(self):
+        return list(self._nodes)
+
+    def __repr__(self):
+        return 'NodeCollection(' + str(self.keys()) + ')'
+
+    where = where
+    montage = montage
+
 def display_all(node, use='max', percentile=75.0):
     return
 
@@ -502,7 +1452,78 @@ STANDARD_ATTRIBUTES = {'get_associates': _get_associates,
                        'display_channels': display_channels,
                        'display_stack': display_stack,
                        'display_rgb': display_rgb,
-                       'display_segs': display_segs}
+                       'display_segs': display_segs,
+                       'share_image': share_image,
+                       'compute_stats': compute_stats,
+                       'load_stats': load_stats,
+                       'where': where,
+                       'montage': montage,
+                       'iter_timepoints': iter_timepoints,
+                       'reduce_time': reduce_time}
+
+# attribute name -> attribute currently registered for all quilt nodes
+_ATTRIBUTES = dict()
+# (node class, attribute name) pairs resolved and cached on the class
+_RESOLVED = set()
+_NODE_PATCHED = False
+
+class _LazyAttribute:
+    """
+    Parameters
+    ----------
+    name: str
+        The name of the registered attribute this descriptor resolves.
+    Output
+    ----------
+    Descriptor installed once on quilt.nodes.Node for each attribute name. On first lookup through a node class it resolves the currently registered attribute, caches it directly on that class so later lookups are plain class attribute lookups, and binds it to the node like any method.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, node, owner):
+        try:
+            attr = _ATTRIBUTES[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+        setattr(owner, self.name, attr)
+        _RESOLVED.add((owner, self.name))
+
+        if hasattr(attr, '__get__'):
+            return attr.__get__(node, owner)
+
+        return attr
+
+def _register_attributes(attributes):
+    """
+    Parameters
+    ----------
+    attributes: dict
+        The complete dictionary of attributes all quilt nodes should have.
+    Output
+    ----------
+    Registers the attributes for lazy resolution, previously registered names are kept. Only names whose attribute changed since the last registration are touched, new names get a _LazyAttribute descriptor and cached class entries of changed names are dropped so they resolve again. Registering the same attributes again does no work.
+    """
+
+    node = quilt.nodes.Node
+    changed = [name for name in attributes
+               if attributes[name] is not _ATTRIBUTES.get(name)]
+    if not changed:
+        return
+
+    for name in changed:
+        _ATTRIBUTES[name] = attributes[name]
+
+    for owner, name in list(_RESOLVED):
+        if name in changed:
+            _RESOLVED.discard((owner, name))
+            if owner is not node:
+                delattr(owner, name)
+
+    for name in changed:
+        if not isinstance(node.__dict__.get(name), _LazyAttribute):
+            setattr(node, name, _LazyAttribute(name))
 
 class QuiltLoader:
     """
@@ -518,7 +1539,7 @@ class QuiltLoader:
     Output
     ----------
     Changes __len__ and __getitem__ functions for all quilt.nodes.Node classes to be the QuiltLoader defined functions of get_len and get_node.
-    Adds any navigation functions given by the user
+    Adds any navigation functions given by the user. Attributes are registered once and resolved lazily on first use, so constructing further loaders with the same attributes only updates the package head and load functions.
     """
 
     # TODO:
@@ -535,18 +1556,19 @@ class QuiltLoader:
         pkg = self.ensure_package(self, package)
         setattr(quilt.nodes.Node, 'pkg_head', pkg)
 
-        # set all nodes to have new functions
-        quilt.nodes.Node.__len__ = self.get_len
-        quilt.nodes.Node.__getitem__ = self.get_node
+        # set all nodes to have new functions, only needed once per process
+        global _NODE_PATCHED
+        if not _NODE_PATCHED:
+            quilt.nodes.Node.__len__ = self.get_len
+            quilt.nodes.Node.__getitem__ = self.get_node
+            _NODE_PATCHED = True
 
         # add provided load functions as an attribute
         load_functions = self.add_load_functions(load_functions)
         setattr(quilt.nodes.Node, 'load_functions', load_functions)
 
-        # add all additional attributes
-        attributes = self.add_attributes(attributes)
-        for label, attr in attributes.items():
-            setattr(quilt.nodes.Node, label, attr)
+        # register all additional attributes, resolved on first use
+        _register_attributes(self.add_attributes(attributes))
 
         # return the loaded object
         return pkg
@@ -609,12 +1631,10 @@ class QuiltLoader:
                 return importlib.import_module(name='quilt.data.' +
                                                 org + '.' + package)
             except ModuleNotFoundError:
-                print(org + '/' + pkg + ' has not been installed.')
-                raise ModuleNotFoundError
+                raise ModuleNotFoundError(org + '/' + package + ' has not been installed.')
 
         # no return, raise error
-        print('Must provide either preloaded Quilt package or standard "org/pkg" string.')
-        raise ModuleNotFoundError
+        raise ModuleNotFoundError('Must provide either preloaded Quilt package or standard "org/pkg" string.')
 
     def get_len(self):
         """
@@ -0,0 +1,358 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+import matplotlib.image as mpimg
+import numpy as np
+import threading
+import hashlib
+import quilt
+import json
+import io
+import os
+
+import tifffile as tfle
+
+from .quiltloader import (QuiltLoader, _image_path, _project_channels, _tiff_layout,
+                          _standard_channels, _downsample, _channels_to_rgb, _rgb_limits)
+
+KNOWN_ASSOCIATES = ['plates', 'wells', 'lines', 'fovs', 'cell_segs', 'nuclei_segs', 'structure_segs']
+
+class _LRUCache:
+    """
+    Parameters
+    ----------
+    maxsize: int
+        The maximum number of items to hold.
+    Output
+    ----------
+    A thread safe least recently used cache. Values computed by get_or_compute are decoded once even when many requests for the same key arrive at the same time, later requests wait on the first.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._pending = dict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = [threading.Event(), None, None]
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            pending[0].wait()
+            if pending[2] is not None:
+                raise pending[2]
+            return pending[1]
+
+        try:
+            pending[1] = compute()
+        except Exception as e:
+            pending[2] = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if pending[2] is None:
+                    self._items[key] = pending[1]
+                    while len(self._items) > self.maxsize:
+                        self._items.popitem(last=False)
+            pending[0].set()
+
+        return pending[1]
+
+def _node_hash(node):
+    """
+    Parameters
+    ----------
+    node: quilt.nodes.GroupNode
+        The node to hash.
+    Output
+    ----------
+    Returns a short hash identifying the image content of a node. Quilt stores package objects under their content hash, so the resolved object path together with its size and modification time changes only when the data does.
+    """
+
+    path = _image_path(node)
+    stat = os.stat(path)
+    key = path + ':' + str(stat.st_size) + ':' + str(stat.st_mtime)
+
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def _associate_names(node):
+    # names of the associated nodes that exist in the package
+    meta = node['info']
+    associates = dict()
+    for known in KNOWN_ASSOCIATES:
+        if known not in meta:
+            continue
+
+        try:
+            group = getattr(node.pkg_head, known)
+        except AttributeError:
+            continue
+
+        associates[known] = [name for name in meta[known] if name in group.__dict__]
+
+    return associates
+
+def _encode_png(rgb):
+    buffer = io.BytesIO()
+    mpimg.imsave(buffer, rgb, format='png')
+
+    return buffer.getvalue()
+
+class _RequestError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class QuiltServer(ThreadingHTTPServer):
+    """
+    Parameters
+    ----------
+    package: str/ quilt.nodes.PackageNode
+        The package to serve, as a standard "org/pkg" string or preloaded package.
+    host: str
+        The host to bind to.
+        Default: '127.0.0.1'
+    port: int
+        The port to bind to.
+        Default: 8000
+    workers: int
+        Maximum number of images decoded at the same time.
+        Default: 4
+    cache_size: int
+        Maximum number of metadata frames and projections held in the LRU cache.
+        Default: 128
+    Output
+    ----------
+    A threaded HTTP server exposing package metadata, associations, and projection images. Image decoding is bounded by a worker pool and projections are cached, so repeated requests for the same node do not re-decode the image. Image responses carry an ETag derived from the node hash and request parameters.
+
+    Endpoints
+    ----------
+    /                                       package groups
+    /<group>                                as_dataframe of a base level node as json records
+    /<group>/<node>                         node info
+    /<group>/<node>/associates              names of associated nodes
+    /<group>/<node>/projection.png          full resolution rgb projection
+    /<group>/<node>/thumbnail.png           rgb projection downsampled to size, default 256
+    /<group>/<node>/tile/<row>/<col>.png    tile of the full resolution projection, tile size set by tile, default 256
+    Image endpoints accept channels (ex: 1,3,5), use (max, mean, percentile), percentile, and t query parameters.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, package, host='127.0.0.1', port=8000, workers=4, cache_size=128):
+        self.pkg = QuiltLoader(package)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.cache = _LRUCache(cache_size)
+        super().__init__((host, port), _QuiltRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
+
+    def get_node(self, group, name=None):
+        node = self.pkg.__dict__.get(group)
+        if group.startswith('_') or not isinstance(node, quilt.nodes.GroupNode):
+            raise _RequestError(404, 'unknown group: ' + group)
+
+        if name is None:
+            return node
+
+        child = node.__dict__.get(name)
+        if name.startswith('_') or child is None:
+            raise _RequestError(404, 'unknown node: ' + group + '/' + name)
+
+        return child
+
+    def shape(self, node, node_hash):
+        # [t, z, c, y, x] shape of a node image, parsed from the tiff header once
+        def compute():
+            with tfle.TiffFile(_image_path(node)) as tif:
+                return _tiff_layout(tif)[4]
+
+        return self.cache.get_or_compute(('shape', node_hash), compute)
+
+    def projection(self, node, key):
+        channels, use, percentile, timepoint = key[2:6]
+        channels = list(channels)
+
+        def compute():
+            path = _image_path(node)
+            # limits are selected with the channels actually projected
+            contrast_limits = node.__dict__.get('_contrast_limits')
+            decode = self.pool.submit(_project_channels, path, channels, use, percentile, timepoint)
+            planes, used = decode.result()
+            while len(planes) < 3:
+                planes.append(np.zeros(planes[0].shape))
+
+            return _channels_to_rgb(planes[0], planes[1], planes[2], _rgb_limits(contrast_limits, used))
+
+        return self.cache.get_or_compute(key, compute)
+
+class _QuiltRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        parts = [part for part in url.path.split('/') if part]
+
+        try:
+            self.route(parts, params)
+        except _RequestError as e:
+            self.send_json({'error': str(e)}, status=e.status)
+        except Exception as e:
+            self.send_json({'error': repr(e)}, status=500)
+
+    def route(self, parts, params):
+        server = self.server
+
+        if len(parts) == 0:
+            groups = [name for name, node in server.pkg.items()
+                      if isinstance(node, quilt.nodes.GroupNode)]
+            return self.send_json({'groups': groups})
+
+        if len(parts) == 1:
+            group = server.get_node(parts[0])
+            frame = server.cache.get_or_compute(
+                        ('frame', parts[0]),
+                        lambda: group.as_dataframe().to_json(orient='records'))
+            return self.send_body(frame.encode('utf-8'), 'application/json')
+
+        node = server.get_node(parts[0], parts[1])
+        if len(parts) == 2:
+            return self.send_json(node['info'])
+
+        if parts[2:] == ['associates']:
+            return self.send_json(_associate_names(node))
+
+        if parts[2] in ['projection.png', 'thumbnail.png', 'tile']:
+            return self.send_image(node, parts[2:], params)
+
+        raise _RequestError(404, 'unknown endpoint: ' + self.path)
+
+    def send_image(self, node, parts, params):
+        try:
+            channels = tuple(int(c) for c in params.get('channels', ['1,3,5'])[0].split(','))
+            use = params.get('use', ['max'])[0]
+            percentile = float(params.get('percentile', ['75.0'])[0])
+            timepoint = int(params.get('t', ['0'])[0])
+            size = int(params.get('size', ['256'])[0])
+            tile = int(params.get('tile', ['256'])[0])
+            if parts[0] == 'tile':
+                row = int(parts[1])
+                col = int(parts[2].replace('.png', ''))
+        except (ValueError, IndexError):
+            raise _RequestError(400, 'invalid image parameters: ' + self.path)
+
+        if use not in ['max', 'mean', 'percentile']:
+            raise _RequestError(400, 'use must be "max", "mean", or "percentile"')
+        if not 0 <= percentile <= 100:
+            raise _RequestError(400, 'percentile must be between 0 and 100')
+        if size <= 0 or tile <= 0:
+            raise _RequestError(400, 'size and tile must be positive')
+        if parts[0] == 'tile' and (row < 0 or col < 0):
+            raise _RequestError(400, 'tile row and column must not be negative')
+
+        try:
+            node_hash = _node_hash(node)
+        except (AttributeError, KeyError, TypeError):
+            raise _RequestError(404, 'node has no image: ' + self.path)
+
+        shape = self.server.shape(node, node_hash)
+        if not 0 <= timepoint < shape[0]:
+            raise _RequestError(400, 'timepoint ' + str(timepoint) + ' out of range for ' +
+                                str(shape[0]) + ' timepoints')
+
+        # images without the standard 7 channels are read as channels [0, 1, 2], check the channels actually read
+        if any(c < 0 for c in channels) or any(c >= shape[2] for c in _standard_channels(channels, shape[2])):
+            raise _RequestError(400, 'channels ' + ','.join(str(c) for c in channels) +
+                                ' out of range for ' + str(shape[2]) + ' channels')
+
+        # keyed by node hash so an etag can be checked without decoding
+        # the full contrast limits are keyed since the projected channels are only known after reading
+        limits = node.__dict__.get('_contrast_limits')
+        projection_key = ('projection', node_hash, channels, use, percentile, timepoint, repr(limits))
+        key = projection_key
+        if parts[0] == 'thumbnail.png':
+            key = key + ('thumbnail', size)
+        elif parts[0] == 'tile':
+            key = key + ('tile', tile, row, col)
+
+        etag = '"' + hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:24] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        def encode():
+            rgb = self.server.projection(node, projection_key)
+            out = rgb
+            if parts[0] == 'thumbnail.png':
+                out = np.stack([_downsample(rgb[:, :, i], size) for i in range(3)], -1).astype(np.uint8)
+            elif parts[0] == 'tile':
+                out = rgb[row * tile:(row + 1) * tile, col * tile:(col + 1) * tile]
+                if out.size == 0:
+                    raise _RequestError(404, 'tile out of range')
+
+            return _encode_png(out)
+
+        body = self.server.cache.get_or_compute(('png',) + key, encode)
+        self.send_body(body, 'image/png', etag)
+
+    def send_json(self, obj, status=200):
+        self.send_body(json.dumps(obj).encode('utf-8'), 'application/json', status=status)
+
+    def send_body(self, body, content_type, etag=None, status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve(package, host='127.0.0.1', port=8000, workers=4, cache_size=128):
+    """
+    Parameters
+    ----------
+    package: str/ quilt.nodes.PackageNode
+        The package to serve, as a standard "org/pkg" string or preloaded package.
+    host: str
+        The host to bind to.
+        Default: '127.0.0.1'
+    port: int
+        The port to bind to.
+        Default: 8000
+    workers: int
+        Maximum number of images decoded at the same time.
+        Default: 4
+    cache_size: int
+        Maximum number of metadata frames and projections held in the LRU cache.
+        Default: 128
+    Output
+    ----------
+    Starts a QuiltServer and serves requests until interrupted.
+    """
+
+    server = QuiltServer(package, host=host, port=port, workers=workers, cache_size=cache_size)
+    print('serving ' + str(package) + ' on http://' + host + ':' + str(server.server_port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,202 @@
+from multiprocessing import shared_memory, resource_tracker
+import threading
+import numpy as np
+import os
+
+# name -> [SharedMemory, handle count, owner]
+_SEGMENTS = dict()
+_SEGMENTS_LOCK = threading.Lock()
+# pid of the process whose resource tracker was started by an attach, not inherited from the owner
+_PRIVATE_TRACKER_PID = None
+
+def _acquire_segment(name, size=0, create=False):
+    """
+    Parameters
+    ----------
+    name: str
+        The shared memory block name to create or attach to.
+    size: int
+        Number of bytes to allocate when creating a new block.
+    create: boolean
+        Boolean determining if a new block should be allocated.
+    Output
+    ----------
+    Returns the process local SharedMemory object for the named block and increments its handle count. Blocks attached to (not created) by this process are opened untracked where supported. Older pythons register the attach with the resource tracker, which is left registered when it is shared with the owner so the owner's unlink and crash cleanup still work.
+    """
+
+    with _SEGMENTS_LOCK:
+        if name is not None and name in _SEGMENTS:
+            _SEGMENTS[name][1] += 1
+            return _SEGMENTS[name][0]
+
+        if create:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        else:
+            try:
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # python < 3.13 always tracks, pool workers normally share the owner's tracker
+                # and unregistering there would drop the owner's registration, only a tracker
+                # started by an attach (a worker forked before the owner's) is private
+                global _PRIVATE_TRACKER_PID
+                if getattr(resource_tracker._resource_tracker, '_fd', None) is None:
+                    _PRIVATE_TRACKER_PID = os.getpid()
+
+                shm = shared_memory.SharedMemory(name=name)
+                if _PRIVATE_TRACKER_PID == os.getpid():
+                    resource_tracker.unregister(shm._name, 'shared_memory')
+
+        _SEGMENTS[shm.name] = [shm, 1, create]
+        return shm
+
+def _release_segment(name):
+    """
+    Parameters
+    ----------
+    name: str
+        The shared memory block name to release a handle of.
+    Output
+    ----------
+    Decrements the handle count of the named block. Once no handles remain in this process the block is closed, and if this process created the block it is also unlinked.
+    """
+
+    with _SEGMENTS_LOCK:
+        if name not in _SEGMENTS:
+            return
+
+        _SEGMENTS[name][1] -= 1
+        if _SEGMENTS[name][1] > 0:
+            return
+
+        shm, count, owner = _SEGMENTS.pop(name)
+
+    try:
+        shm.close()
+    except BufferError:
+        # outstanding ndarray views keep the mapping alive until they are dropped
+        pass
+
+    if owner:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+def _attach_shared_image(name, shape, dtype):
+    # unpickle target, attaches in the receiving process
+    return SharedImage(name, shape, dtype)
+
+class SharedImage:
+    """
+    Parameters
+    ----------
+    name: str
+        The name of an existing shared memory block holding the image data.
+    shape: tuple
+        The shape of the image stored in the block.
+        Standard AICS image: [t, z, channel, y, x]
+    dtype: str/ np.dtype
+        The dtype of the image stored in the block.
+    Output
+    ----------
+    A handle to an ndarray living in a multiprocessing.shared_memory block. Pickling a SharedImage only sends the block name, shape, and dtype, so passing one to a worker pool does not copy the pixel data through the pipe, the worker attaches to the same memory instead.
+    Every handle in a process counts as a reference to the block, the block is closed when the last handle in a process is closed and unlinked when the last handle in the creating process is closed. The creating process should keep its handle open until all workers are finished with the image.
+    """
+
+    def __init__(self, name, shape, dtype, _create=False):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = int(np.prod(self.shape)) * self.dtype.itemsize
+
+        self._shm = _acquire_segment(name, size, create=_create)
+        self.name = self._shm.name
+        self._array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    @classmethod
+    def from_array(cls, img):
+        """
+        Parameters
+        ----------
+        img: TiffFile/ ndarray
+            Either TiffFile or ndarray to copy into shared memory.
+        Output
+        ----------
+        Allocates a new shared memory block, copies the image data into it once, and returns the owning SharedImage handle. A TiffFile is decoded directly into the block, so no second full copy of the image is made.
+        """
+
+        if hasattr(img, 'series') and hasattr(img, 'asarray'):
+            # size the block from the tiff header and decode into it
+            series = img.series[0]
+            shared = cls(None, series.shape, series.dtype, _create=True)
+            try:
+                img.asarray(out=shared.array)
+            except Exception:
+                shared.close()
+                raise
+
+            return shared
+
+        if not isinstance(img, np.ndarray):
+            raise TypeError('SharedImage.from_array requires img to be either type TiffFile or ndarray.')
+
+        shared = cls(None, img.shape, img.dtype, _create=True)
+        shared._array[...] = img
+
+        return shared
+
+    @property
+    def array(self):
+        """
+        Output
+        ----------
+        Returns the ndarray view over the shared memory block. Views must not be used after the handle is closed.
+        """
+
+        if self._array is None:
+            raise ValueError('SharedImage "' + str(self.name) + '" has been closed.')
+
+        return self._array
+
+    @property
+    def closed(self):
+        return self._array is None
+
+    def close(self):
+        """
+        Output
+        ----------
+        Releases this handles reference to the shared memory block. Any ndarray views taken from this handle must be dropped first.
+        """
+
+        if self._array is None:
+            return
+
+        self._array = None
+        self._shm = None
+        _release_segment(self.name)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.array
+
+        return self.array.astype(dtype)
+
+    def __reduce__(self):
+        return (_attach_shared_image, (self.name, self.shape, self.dtype.str))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __repr__(self):
+        return ('SharedImage(name=' + repr(self.name) +
+                ', shape=' + str(self.shape) +
+                ', dtype=' + str(self.dtype) + ')')
@@ -0,0 +1,11 @@
+import pytest
+
+@pytest.fixture
+def package(tmp_path):
+    # a loaded two fov package and the pixel data of each fov
+    import quiltloader as ql
+    from .utils import build_package
+
+    pkg, images = build_package(tmp_path)
+
+    return ql.QuiltLoader(pkg), images
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import json
+import sys
+import os
+
+import quiltloader as ql
+from quiltloader import cli
+from .utils import build_package
+
+@pytest.fixture
+def install(tmp_path, monkeypatch):
+    # make stub packages resolvable as installed "test/<name>" packages
+    def install(name, **kwargs):
+        directory = tmp_path / name
+        directory.mkdir()
+        pkg, images = build_package(directory, **kwargs)
+        monkeypatch.setitem(sys.modules, 'quilt.data.test.' + name, pkg)
+        return pkg, images
+
+    return install
+
+def _run(capsys, *args):
+    status = cli.main(list(args) + ['-q'])
+    return status, json.loads(capsys.readouterr().out)
+
+def test_checkpoint_skips_and_reprocesses(tmp_path, install, capsys):
+    install('pkg')
+    output = str(tmp_path / 'out')
+    projection = os.path.join(output, 'projections', 'fovs', 'fov_0.npy')
+
+    status, summary = _run(capsys, 'project', 'test/pkg', '-o', output)
+    assert status == 0
+    assert (summary['completed'], summary['skipped']) == (2, 0)
+    assert np.load(projection).shape == (3, 32, 32)
+
+    status, summary = _run(capsys, 'project', 'test/pkg', '-o', output)
+    assert (summary['completed'], summary['skipped']) == (0, 2)
+
+    # changed options are stale
+    status, summary = _run(capsys, 'project', 'test/pkg', '-o', output, '--channels', '0')
+    assert (summary['completed'], summary['skipped']) == (2, 0)
+    assert np.load(projection).shape == (1, 32, 32)
+
+    # a partial line from an interrupted write is ignored
+    with open(os.path.join(output, '.checkpoints', 'project.jsonl'), 'a') as write_out:
+        write_out.write('{"group": "fo')
+    for i in range(2):
+        status, summary = _run(capsys, 'project', 'test/pkg', '-o', output, '--channels', '0')
+        assert (summary['completed'], summary['skipped']) == (0, 2)
+
+    status, summary = _run(capsys, 'project', 'test/pkg', '-o', output, '--channels', '0', '--restart')
+    assert (summary['completed'], summary['skipped']) == (2, 0)
+
+def test_checkpoint_keyed_by_image(tmp_path, install, capsys):
+    install('pkg', n_fovs=3)
+    pkg, images = install('other', n_fovs=2, shape=(1, 2, 3, 16, 16))
+    output = str(tmp_path / 'out')
+
+    status, summary = _run(capsys, 'stats', 'test/pkg', '-o', output)
+    assert summary['completed'] == 3
+
+    status, summary = _run(capsys, 'stats', 'test/other', '-o', output, '-w', '2')
+    assert (summary['completed'], summary['skipped']) == (2, 0)
+
+    with open(os.path.join(output, 'fovs_stats.json')) as read_in:
+        stats = json.load(read_in)
+    assert len(stats['channels']) == 3
+    assert sorted(stats['nodes']) == ['fov_0', 'fov_1']
+
+    # merged from the checkpoint, the same as computing in memory
+    expected = ql.QuiltLoader(pkg).fovs.compute_stats()
+    assert stats['channels'] == json.loads(json.dumps(expected['channels']))
+
+def test_missing_package(capsys):
+    assert cli.main(['index', 'test/missing', '-q']) == 1
+    assert 'test/missing has not been installed.' in capsys.readouterr().err
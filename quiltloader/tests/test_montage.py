@@ -0,0 +1,11 @@
+def test_unreadable_fov_leaves_blank_tile(package, capsys):
+    pkg, images = package
+    with open(pkg.fovs.fov_1.image.load(), 'wb') as write_out:
+        write_out.write(b'not a tiff')
+
+    canvas = pkg.fovs.montage(shape=(1, 2), tile=32)
+
+    assert canvas.shape == (32, 64, 3)
+    assert canvas[:, :32].any()
+    assert not canvas[:, 32:].any()
+    assert 'fov_1' in capsys.readouterr().out
@@ -0,0 +1,107 @@
+import urllib.request
+import urllib.error
+import threading
+import pytest
+import json
+
+from quiltloader.server import QuiltServer, _LRUCache
+
+@pytest.fixture
+def server(package):
+    pkg, images = package
+    server = QuiltServer(pkg, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+def _get(server, path, headers={}):
+    request = urllib.request.Request('http://127.0.0.1:' + str(server.server_port) + path, headers=headers)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+def test_metadata(server):
+    status, headers, body = _get(server, '/')
+    assert status == 200
+    assert json.loads(body) == {'groups': ['fovs']}
+
+    status, headers, body = _get(server, '/fovs')
+    assert status == 200
+    assert [record['node'] for record in json.loads(body)] == ['fov_0', 'fov_1']
+
+    status, headers, body = _get(server, '/fovs/fov_0')
+    assert json.loads(body) == {'line': 'AICS-0'}
+
+    assert _get(server, '/missing')[0] == 404
+    assert _get(server, '/fovs/missing')[0] == 404
+    assert _get(server, '/fovs/fov_0/missing')[0] == 404
+
+def test_images_are_cached_with_etags(server):
+    status, headers, body = _get(server, '/fovs/fov_0/thumbnail.png?size=16')
+    assert status == 200
+    assert body.startswith(b'\x89PNG')
+
+    etag = headers['ETag']
+    assert _get(server, '/fovs/fov_0/thumbnail.png?size=16', {'If-None-Match': etag})[0] == 304
+    # another size is another image, the projection is decoded once for both
+    status, headers, body = _get(server, '/fovs/fov_0/thumbnail.png?size=8', {'If-None-Match': etag})
+    assert status == 200
+    assert headers['ETag'] != etag
+    assert len([key for key in server.cache._items if key[0] == 'projection']) == 1
+
+@pytest.mark.parametrize('path', ['/fovs/fov_0/tile/-2/0.png?tile=16',
+                                  '/fovs/fov_0/tile/0/-1.png?tile=16',
+                                  '/fovs/fov_0/tile/0/0.png?tile=0',
+                                  '/fovs/fov_0/thumbnail.png?size=0',
+                                  '/fovs/fov_0/thumbnail.png?channels=9',
+                                  '/fovs/fov_0/thumbnail.png?channels=-1',
+                                  '/fovs/fov_0/thumbnail.png?channels=a',
+                                  '/fovs/fov_0/thumbnail.png?t=2',
+                                  '/fovs/fov_0/thumbnail.png?use=median',
+                                  '/fovs/fov_0/thumbnail.png?use=percentile&percentile=101'])
+def test_invalid_image_parameters(server, path):
+    assert _get(server, path)[0] == 400
+
+def test_tiles(server):
+    assert _get(server, '/fovs/fov_0/tile/1/1.png?tile=16')[0] == 200
+    assert _get(server, '/fovs/fov_0/tile/2/0.png?tile=16')[0] == 404
+
+def test_lru_cache():
+    cache = _LRUCache(2)
+    calls = list()
+    def compute(key):
+        calls.append(key)
+        return key * 2
+
+    for key in [1, 2, 1, 3, 1, 2]:
+        assert cache.get_or_compute(key, lambda: compute(key)) == key * 2
+
+    # 2 is evicted by 3 as the least recently used, 1 stays cached
+    assert calls == [1, 2, 3, 2]
+
+def test_lru_cache_computes_concurrent_requests_once():
+    cache = _LRUCache()
+    release = threading.Event()
+    calls = list()
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'value'
+
+    results = list()
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+               for i in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['value'] * 4
+    assert calls == [1]
@@ -0,0 +1,75 @@
+import subprocess
+import numpy as np
+import pickle
+import pytest
+import sys
+import os
+
+from quiltloader.shared import SharedImage, _SEGMENTS
+
+POOL_SCRIPT = """
+import multiprocessing
+import numpy as np
+from quiltloader.shared import SharedImage
+
+if __name__ == '__main__':
+    context = multiprocessing.get_context('{method}')
+    if {pool_first}:
+        pool = context.Pool(2)
+    shared = SharedImage.from_array(np.ones((4, 4), dtype=np.uint16))
+    if not {pool_first}:
+        pool = context.Pool(2)
+
+    print([int(total) for total in pool.map(np.sum, [shared] * 4)])
+    pool.close()
+    pool.join()
+
+    with SharedImage(shared.name, shared.shape, shared.dtype) as attached:
+        print(int(attached.array.sum()))
+    shared.close()
+"""
+
+@pytest.mark.parametrize('method, pool_first', [('spawn', False),
+                                                ('fork', False),
+                                                ('fork', True)])
+def test_pool_round_trip(tmp_path, method, pool_first):
+    script = tmp_path / 'pool.py'
+    script.write_text(POOL_SCRIPT.format(method=method, pool_first=pool_first))
+
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env['PYTHONPATH'] = os.pathsep.join([root] + [p for p in sys.path if p])
+
+    # the resource tracker shares stderr, unregister errors and leak warnings show up there
+    run = subprocess.run([sys.executable, str(script)], env=env, capture_output=True, text=True, timeout=120)
+    assert run.returncode == 0, run.stderr
+    assert run.stdout.split('\n')[:2] == ['[16, 16, 16, 16]', '16']
+    assert 'KeyError' not in run.stderr
+    assert 'leaked' not in run.stderr
+
+def test_handles_are_reference_counted():
+    shared = SharedImage.from_array(np.ones((4, 4)))
+    copy = pickle.loads(pickle.dumps(shared))
+    assert _SEGMENTS[shared.name][1] == 2
+
+    shared.close()
+    assert copy.array.sum() == 16
+    assert _SEGMENTS[copy.name][1] == 1
+
+    name = copy.name
+    copy.close()
+    assert name not in _SEGMENTS
+    with pytest.raises(ValueError):
+        copy.array
+    with pytest.raises(FileNotFoundError):
+        SharedImage(name, (4, 4), np.float64)
+
+def test_share_image_does_not_cache(package):
+    pkg, images = package
+    node = pkg.fovs.fov_0
+
+    with node.share_image() as shared:
+        assert shared.shape == images['fov_0'].shape
+        assert np.array_equal(shared.array, images['fov_0'])
+
+    assert '_mem_img' not in node.__dict__
@@ -0,0 +1,34 @@
+import numpy as np
+
+from quiltloader.quiltloader import _ChannelStats
+
+def test_merged_samples_are_capped():
+    random = np.random.RandomState(0)
+    merged = _ChannelStats(np.float32)
+    values = list()
+    for node in range(20):
+        stats = _ChannelStats(np.float32)
+        for plane in range(20):
+            plane = random.normal(0, 1 + node % 3, (128, 128)).astype(np.float32)
+            stats.add(plane)
+            values.append(plane.ravel())
+
+        merged.merge(stats)
+        assert sum(sample.size for sample in merged.samples) <= merged.max_samples
+
+    values = np.concatenate(values)
+    assert merged.count == values.size
+    assert np.allclose(merged.percentiles([1.0, 50.0, 99.0]),
+                       np.percentile(values, [1.0, 50.0, 99.0]),
+                       atol=0.1)
+
+def test_exact_stats_match_numpy(package):
+    pkg, images = package
+    stats = pkg.fovs.compute_stats(percentiles=[1.0, 50.0, 99.0])
+
+    values = np.concatenate([img[:, :, 3].ravel() for img in images.values()])
+    channel = stats['channels'][3]
+    assert channel['count'] == values.size
+    assert channel['min'] == values.min()
+    assert channel['max'] == values.max()
+    assert channel['percentiles']['50.0'] == np.percentile(values, 50.0, method='inverted_cdf')
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+def test_iter_timepoints(package):
+    pkg, images = package
+    node = pkg.fovs.fov_0
+    img = images['fov_0']
+
+    volumes = list(node.iter_timepoints(channels=[1, 3, 1]))
+    assert len(volumes) == img.shape[0]
+    for t, volume in enumerate(volumes):
+        assert np.array_equal(volume, img[t][:, [1, 3, 1]])
+
+    projection, = node.iter_timepoints(project='max', channels=[5], timepoints=[1])
+    assert np.array_equal(projection, img[1][:, [5]].max(axis=0))
+
+    assert np.array_equal(node.reduce_time('max', project='mean'), img.mean(axis=1).max(axis=0))
+
+@pytest.mark.parametrize('channels, timepoints', [([9], None),
+                                                  ([1, 9], None),
+                                                  ([-1], None),
+                                                  ([1], [2]),
+                                                  ([1], [-1])])
+@pytest.mark.parametrize('project', [None, 'max', 'mean', 'percentile'])
+def test_iter_timepoints_out_of_range(package, channels, timepoints, project):
+    pkg, images = package
+    with pytest.raises(IndexError):
+        next(pkg.fovs.fov_0.iter_timepoints(project=project, channels=channels, timepoints=timepoints))
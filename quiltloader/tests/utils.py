@@ -0,0 +1,56 @@
+import tifffile as tfle
+import numpy as np
+import quilt
+import json
+
+SHAPE = (2, 3, 7, 32, 32)
+
+class StubGroup(quilt.nodes.GroupNode):
+    # child nodes are held as attributes the way quiltloader reads them
+    def __init__(self, **children):
+        self.__dict__.update(children)
+
+class StubPackage(StubGroup, quilt.nodes.PackageNode):
+    pass
+
+class StubData(quilt.nodes.DataNode):
+    # resolves to a file path like a built quilt data node
+    def __init__(self, path):
+        self.__dict__['_path'] = path
+
+    def load(self):
+        return self._path
+
+def write_fov(directory, name, seed, shape=SHAPE):
+    img = np.random.RandomState(seed).randint(0, 4000, shape).astype(np.uint16)
+    image_path = str(directory / (name + '.ome.tif'))
+    tfle.imwrite(image_path, img, metadata={'axes': 'TZCYX'})
+
+    info_path = str(directory / (name + '.json'))
+    with open(info_path, 'w') as write_out:
+        json.dump({'line': 'AICS-' + str(seed)}, write_out)
+
+    return StubGroup(image=StubData(image_path), info=StubData(info_path)), img
+
+def build_package(directory, n_fovs=2, shape=SHAPE):
+    """
+    Parameters
+    ----------
+    directory: pathlib.Path
+        The directory to write the generated images and info files to.
+    n_fovs: int
+        Number of fov nodes to generate.
+    shape: tuple
+        The [t, z, channel, y, x] shape of each generated image.
+    Output
+    ----------
+    Returns a stub package with a single "fovs" base level node, and a dict of the pixel data written for each fov node.
+    """
+
+    fovs = dict()
+    images = dict()
+    for i in range(n_fovs):
+        name = 'fov_' + str(i)
+        fovs[name], images[name] = write_fov(directory, name, i, shape)
+
+    return StubPackage(fovs=StubGroup(**fovs)), images
@@ -69,3 +69,4 @@ MINOR = _version_minor
 MICRO = _version_micro
 VERSION = __version__
 REQUIRES = ["quilt", "numpy", "tifffile", "matplotlib"]
+ENTRY_POINTS = {"console_scripts": ["quiltloader=quiltloader.cli:main"]}
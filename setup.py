@@ -22,7 +22,8 @@ opts = dict(name=NAME,
             version=VERSION,
             packages=PACKAGES,
             install_requires=REQUIRES,
-            requires=REQUIRES)
+            requires=REQUIRES,
+            entry_points=ENTRY_POINTS)
 
 if __name__ == "__main__":
     setup(**opts)